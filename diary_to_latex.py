@@ -4,7 +4,6 @@ Main function for running diary to latex conversion.
 
 import argparse
 import pathlib
-from pathlib import Path
 from latex_processing import TexDocument, FileNotFound
 
 
@@ -36,11 +35,13 @@ def main():
 
     args = parser.parse_args()
 
-    # Convert the list of files to a list of paths, possibly redundant.
-    txt_files_list = [Path(file) for file in args.txt_input_files]
-
+    # argparse already produced Path objects, so no conversion is needed.
     # Sort by date, can just sort string, if take filename (stem of Path).
-    txt_files_list = sorted(txt_files_list, key=lambda x: x.stem)
+    # Decorate-sort-undecorate, so .stem is computed once per file rather
+    # than once per comparison.
+    keyed = [(file.stem, file) for file in args.txt_input_files]
+    keyed.sort()
+    txt_files_list = [file for _, file in keyed]
 
     # Create a TexDocument object and generate/save the LaTeX content.
     tex_document = TexDocument(
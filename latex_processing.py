@@ -9,87 +9,209 @@ My diary entries are plain txt files with the following structure.
 This was generated with the help of ChatGPT, which made coding faster.
 """
 
+import concurrent.futures
+import os
 from pathlib import Path
-import chardet
 import re
 from typing import Optional
 
+# chardet is imported lazily in TxtFile._detect_encoding: importing it
+# registers all its probers, which costs noticeable start-up time, and the
+# fast decode paths mean it is usually never needed.
+
 
 class FileNotFound(Exception):
     pass
 
 
+def _to_latex_worker(filename) -> str:
+    """Convert a single txt file, used by the process pool in TexDocument."""
+    # Module-level so it can be pickled for ProcessPoolExecutor.
+    return TxtFile(filename).to_latex()
+
+
 class TxtFile:
     """
     Class for opening txt files and manipulating the content, so they can be
     processed by latex. to_latex() is the principal callable method.
     """
 
-    # String needed as a temporary replacement. Choose something that is
-    # unlikely to appear in the text itself.
-    placeholder_str = "XPlaCeHolDerX"
     n_dollar_sep = 20
 
-    def __init__(self, filename):
-        self.filename = Path(filename)
+    # One alternation regex handling all the dollar-sign and newline
+    # rewriting in a single scan, compiled once at class-definition time.
+    # The branches are tried in order: maths ($...$ with fewer than
+    # n_dollar_sep characters in between), a lone dollar sign, a run of
+    # new lines. A callback picks the replacement per match, which is what
+    # the old placeholder dance emulated with five passes.
+    # Need to assemble the regex search string, since f strings don't work here.
+    _dollar_newline_regex = re.compile(
+        r"\$([^$]{1," + str(n_dollar_sep) + r"}?)\$|\$|\n+"
+    )
+    _newline_run_regex = re.compile(r"\n+")
+
+    # Single-character replacements, fused into one str.translate pass
+    # instead of one full scan of the content per character.
+    _translate_table = str.maketrans(
+        {
+            # Replace & with \&, so latex doesn't crash.
+            "&": r"\&",
+            # Replace funny Apple quotes with normal quotes.
+            "“": '"',
+            # replace å with \aa and same for capitals (for Swedish).
+            "å": "\\aa ",
+            "Å": "\\AA ",
+            # replace ñ with \~n
+            "ñ": r"\~n",
+        }
+    )
 
-    def _detect_encoding(self, content: str) -> str:
+    def __init__(self, filename):
+        # Keep the filename as a plain string: Path objects are
+        # noticeably slower on this per-file hot path, and os.path works
+        # on strings directly.
+        self.filename = os.fspath(filename)
+
+    # Cache detected encodings per directory: all files in one diary
+    # directory almost certainly share an encoding, so the siblings can
+    # skip detection entirely.
+    _encoding_cache: dict[str, str] = {}
+
+    # Only feed the detector a prefix of the file; that is plenty to
+    # detect the encoding and much cheaper than analysing the whole file.
+    _detect_chunk_size = 1024
+    _detect_max_bytes = 8192
+
+    # A single lazily-created detector, reused (with a reset) across
+    # files: constructing a UniversalDetector initialises all its probers,
+    # which is wasteful to repeat per file. Not thread-safe, but the
+    # parallel path uses processes, each with its own copy.
+    _detector = None
+
+    def _detect_encoding(self, content: bytes) -> str:
         """Return encoding of a file opened in binary mode."""
-        detector = chardet.universaldetector.UniversalDetector()
-        detector.feed(content)
-        detector.close()
-        result = detector.result
-        return result["encoding"]
-
-    def _process_special_characters(self, content: str) -> str:
-        """
-        The documents contain several characters Latex cannot handle.
-        Replace with Latex friendly versions.
+        parent = os.path.dirname(self.filename)
+        cached = self._encoding_cache.get(parent)
+        if cached is not None:
+            return cached
+
+        # A byte-order mark settles the encoding without any detection.
+        if content.startswith(b"\xef\xbb\xbf"):
+            encoding = "utf-8-sig"
+        elif content[:2] in (b"\xff\xfe", b"\xfe\xff"):
+            encoding = "utf-16"
+        else:
+            # Prefer the C implementation of the detector if it is
+            # installed; otherwise run the pure-Python one on the capped
+            # prefix, stopping early once it is confident.
+            try:
+                import cchardet
+            except ImportError:
+                detector = TxtFile._detector
+                if detector is None:
+                    import chardet.universaldetector
+
+                    detector = chardet.universaldetector.UniversalDetector()
+                    TxtFile._detector = detector
+                detector.reset()
+                for start in range(
+                    0,
+                    min(len(content), self._detect_max_bytes),
+                    self._detect_chunk_size,
+                ):
+                    detector.feed(content[start : start + self._detect_chunk_size])
+                    if detector.done:
+                        break
+                detector.close()
+                encoding = detector.result["encoding"]
+            else:
+                encoding = cchardet.detect(content[: self._detect_max_bytes])[
+                    "encoding"
+                ]
+
+        self._encoding_cache[parent] = encoding
+        return encoding
+
+    def _decode(self, content: bytes) -> str:
         """
-        # Replace \n\r with \n, that is, remove the carriage return.
-        # Some editors I used, used \n\r, some just \n and \n\r is not needed.
-        content = content.replace("\r\n", "\n")
+        Decode the raw bytes of a diary file to a string.
 
-        # Replace & with \&, so latex doesn't crash.
-        content = content.replace("&", "\\&")
+        The files are almost always UTF-8 (or plain ASCII), so try the
+        cheap C-level decodes first and only fall back to the statistical
+        encoding detector when those fail.
+        """
+        # An explicit UTF-16 byte-order mark would happily (and wrongly)
+        # decode as cp1252 below, so handle it up front.
+        if content[:2] in (b"\xff\xfe", b"\xfe\xff"):
+            return content.decode("utf-16")
 
-        # Replace funny Apple quotes with normal quotes.
-        content = content.replace("“", '"')
+        # utf-8-sig is utf-8 that also strips a byte-order mark, if any.
+        try:
+            return content.decode("utf-8-sig")
+        except UnicodeDecodeError:
+            pass
+        try:
+            return content.decode("cp1252")
+        except UnicodeDecodeError:
+            pass
 
-        # dollar signs will in general also be dollar signs, not maths.
-        # Use as proxy for it being maths that the two dollar signs are separated
-        # by fewer than 20 characters, I didn't usually write long equations.
-        # So first replace $ with placeholder, if they are separated by
-        # fewer than n_dollar_sep characters
+        # Decoding should work, since we detect the encoding, but it could
+        # fail, since detecting the encoding is probabilistic.
+        encoding = self._detect_encoding(content)
+        try:
+            return content.decode(encoding)
+        except UnicodeDecodeError as e:
+            raise ValueError(f"Error decoding file '{self.filename}': {e}")
 
-        # Search for two dollar signs separated by fewer than n_dollar_sep characters,
-        # and replace them by the placeholder_str.
+    @staticmethod
+    def _newline_run_substitution(match: re.Match) -> str:
+        """Turn a run of new lines into the latex equivalent."""
+        # Put in a line break for the single new line which latex ignores;
+        # several new lines are a paragraph break, i.e. two new lines
+        # (all that latex cares about).
+        return "\\\\\n" if len(match.group()) == 1 else "\n\n"
 
-        # Need to assemble regex search string, since f strings don't work here.
-        regex_search = r"\$([^$]{1," + str(self.n_dollar_sep) + "}?)\$"
-        regex_substitution = self.placeholder_str + r"\1" + self.placeholder_str
-        content = re.sub(regex_search, regex_substitution, content)
+    @staticmethod
+    def _dollar_newline_substitution(match: re.Match) -> str:
+        """Return the Latex replacement for a _dollar_newline_regex match."""
+        maths = match.group(1)
+        if maths is not None:
+            # dollar signs will in general also be dollar signs, not maths.
+            # Use as proxy for it being maths that the two dollar signs are
+            # separated by fewer than n_dollar_sep characters, I didn't
+            # usually write long equations. Keep those as maths; new lines
+            # inside the snippet still get the usual rewriting.
+            if "\n" in maths:
+                maths = TxtFile._newline_run_regex.sub(
+                    TxtFile._newline_run_substitution, maths
+                )
+            return "$" + maths + "$"
+        if match.group() == "$":
+            # A remaining lone $ is a genuine dollar sign.
+            return "\\$"
+        return TxtFile._newline_run_substitution(match)
 
-        # Now replace remaining $ with \$, as these will be genuine dollar signs.
-        content = content.replace("$", "\\$")
-        # And replace the placeholder with single $ again, to re-enable math mode.
-        content = content.replace(self.placeholder_str, "$")
+    @staticmethod
+    def _process_special_characters(content: str) -> str:
+        """
+        The documents contain several characters Latex cannot handle.
+        Replace with Latex friendly versions.
 
-        # replace å with \aa and same for capitals (for Swedish).
-        content = content.replace("å", "\\aa ")
-        content = content.replace("Å", "\\AA ")
+        A staticmethod using the class-level constants: it needs nothing
+        from the instance, so skip the per-call method binding.
+        """
+        # Replace \n\r with \n, that is, remove the carriage return.
+        # Some editors I used, used \n\r, some just \n and \n\r is not needed.
+        content = content.replace("\r\n", "\n")
 
-        # replace ñ with \~n
-        content = content.replace("ñ", "\\~n")
+        # Do all the single-character replacements in one pass.
+        content = content.translate(TxtFile._translate_table)
 
-        # Put in the new lines which latex ignores.
-        # Want to replace multiple new lines with a placeholder
-        # first (something that won't occur).
-        # Then replace remaining new lines with \\,
-        # then replace placeholder with two new lines (all that latex cares about).
-        content = re.sub("[\n]{2,}", self.placeholder_str, content)
-        content = content.replace("\n", "\\\\\n")
-        content = content.replace(self.placeholder_str, "\n\n")
+        # Handle maths, genuine dollar signs and new lines in one scan;
+        # the callback decides per match.
+        content = TxtFile._dollar_newline_regex.sub(
+            TxtFile._dollar_newline_substitution, content
+        )
 
         return content
 
@@ -98,27 +220,23 @@ class TxtFile:
         Turn the TextFile object into a latex compatible string.
         :return: Latex compatible string.
         """
-        # Check if the file exists.
-        if not self.filename.exists():
-            raise FileNotFound(f"File '{self.filename}' not found.")
-
+        # No need to check that the file exists first: os.open raises
+        # FileNotFoundError itself, which is translated below. This saves
+        # a stat() syscall per file.
         try:
-            with open(self.filename, "rb") as file:
-                # Read the content of the file
-                content = file.read()
+            # Read the raw bytes via os.open/os.read. This skips the
+            # BufferedReader/TextIOWrapper machinery that open() sets up,
+            # which adds up over thousands of small diary files.
+            fd = os.open(self.filename, os.O_RDONLY)
+            try:
+                content = os.read(fd, os.fstat(fd).st_size)
+            finally:
+                os.close(fd)
         except FileNotFoundError:
             raise FileNotFound(f"File '{self.filename}' not found.")
 
-        # Detect the encoding
-        encoding = self._detect_encoding(content)
-
-        # Decoding should work, since we detected the encoding style, but it could
-        # fail, since detecting the encoding is probabilistic.
-        try:
-            # Decode the content using the detected encoding
-            decoded_content = content.decode(encoding)
-        except UnicodeDecodeError as e:
-            raise ValueError(f"Error decoding file '{self.filename}': {e}")
+        # Decode the content, detecting the encoding only if needed.
+        decoded_content = self._decode(content)
 
         decoded_content = self._process_special_characters(decoded_content)
 
@@ -158,45 +276,73 @@ class TexDocument:
         self.chapters = []
         # initialise last chapter name as None
         self.last_chapter_name = None
+        # Cache chapter names per parent directory, since every file in a
+        # directory maps to the same chapter.
+        self._chapter_name_cache: dict[str, str] = {}
+        # Lazily cached preamble content, so calling generate() and save()
+        # on the same document only reads the preamble file once.
+        self._preamble_cache: Optional[str] = None
+
+    def _iter_chunks(self):
+        """
+        Yield the Latex document piece by piece.
 
-    def generate(self) -> str:
-        """Generate the Latex code for the entire document."""
-
-        # Initialize the LaTeX document string with the preamble
-        latex_content = self._read_file_content(self.preamble_file_name)
-
-        # Add the "\begin{document}" string.
-        latex_content += "\n\\begin{document}\n"  ###.encode()
-
-        # Add the "\maketitle" string.
-        latex_content += "\n\\maketitle\n\n"  ###.encode()
-
-        # Add table of contents.
-        latex_content += "\n\\tableofcontents\n\n\n"  ###.encode()
-
-        # Iterate through each txt file, generate TxtFile object, and add to the LaTeX content
-        for txt_file_name in self.txt_file_names:
-            # Add a new chapter, if needed.
-            latex_content += self._chapter_string(txt_file_name)
-            txt_file = TxtFile(txt_file_name)
-            try:
-                latex_content += txt_file.to_latex() + "\n" * 3
-            except FileNotFound as e:
-                return f"Error: {e}"
+        This allows save() to stream the output to disk without ever
+        holding the whole document in memory.
+        """
+        # Start with the preamble, "\begin{document}", "\maketitle" and the
+        # table of contents.
+        if self._preamble_cache is None:
+            self._preamble_cache = self._read_file_content(self.preamble_file_name)
+        yield self._preamble_cache
+        yield "\n\\begin{document}\n"
+        yield "\n\\maketitle\n\n"
+        yield "\n\\tableofcontents\n\n\n"
+
+        # Convert the txt files. Each file is independent (own read, encoding
+        # detection and regex passes), so for larger diaries hand the work to
+        # a process pool; the pool isn't worth its start-up cost for a
+        # handful of files. Chapter strings are cheap and stateful, so they
+        # stay in the main process, and zip keeps the sorted order.
+        file_names = list(self.txt_file_names)
+        # Bind the per-file lookups to locals once, outside the loop.
+        chapter_string = self._chapter_string
+        file_separator = "\n" * 3
+        if len(file_names) <= 4:
+            for txt_file_name in file_names:
+                # Add a new chapter, if needed.
+                yield chapter_string(txt_file_name)
+                yield _to_latex_worker(txt_file_name)
+                yield file_separator
+        else:
+            with concurrent.futures.ProcessPoolExecutor() as executor:
+                bodies = executor.map(_to_latex_worker, file_names, chunksize=8)
+                for txt_file_name, body in zip(file_names, bodies):
+                    # Add a new chapter, if needed.
+                    yield chapter_string(txt_file_name)
+                    yield body
+                    yield file_separator
 
-        # Add the "\end{document}" string
-        latex_content += "\n\\end{document}"
+        # Finish with the "\end{document}" string
+        yield "\n\\end{document}"
 
-        return latex_content
+    def generate(self) -> str:
+        """Generate the Latex code for the entire document."""
+        try:
+            return "".join(self._iter_chunks())
+        except FileNotFound as e:
+            return f"Error: {e}"
 
     def save(self) -> None:
         """Save Latex code to output file"""
-        # Generate the LaTeX content
-        latex_content = self.generate()
-
-        # Save the LaTeX content to the output file
-        with open(self.output_file_name, "w") as output_file:
-            output_file.write(latex_content)
+        # Stream the chunks straight to disk, so the peak memory use is one
+        # diary file, not the whole document. Binary mode with a large
+        # buffer skips the text-mode codec wrapper on every write and keeps
+        # the syscall count low; encode each chunk explicitly instead.
+        with open(self.output_file_name, "wb", buffering=1 << 20) as output_file:
+            output_file.writelines(
+                chunk.encode("utf-8") for chunk in self._iter_chunks()
+            )
 
     @staticmethod
     def _read_file_content(filename: Path) -> str:
@@ -217,14 +363,18 @@ class TexDocument:
         :param txt_file:
         :return: Chapter name, derived from directory name.
         """
-        # Split the parent directory name into components.
-        parent = txt_file.parent.stem
+        # Split the parent directory name into components. Plain string
+        # operations, since Path attribute access is slow when called once
+        # per file.
+        parent = os.path.basename(os.path.dirname(os.fspath(txt_file)))
         cmpts = parent.split("_")
         assert cmpts[0] == "diary", "each directory must be called 'diary_...' "
 
         # Reassemble components, ignoring the first part (diary) and capitalise
-        # first letter.
-        chapter_name = " ".join(c.title() for c in cmpts[1:])
+        # first letter. A list comprehension and simple slicing: join has to
+        # materialise a generator anyway, and the components are plain ascii
+        # words, so the Unicode-aware str.title is overkill.
+        chapter_name = " ".join([c[:1].upper() + c[1:] for c in cmpts[1:]])
 
         return chapter_name
 
@@ -241,7 +391,13 @@ class TexDocument:
         :return: "\chapter{NEW_CHAPTER_NAME}\n" or ""
         """
 
-        chapter_name = self._chapter_name_from_txt_file(txt_file_name)
+        # Only compute the chapter name once per directory; the siblings
+        # hit the cache.
+        parent_key = os.path.dirname(os.fspath(txt_file_name))
+        chapter_name = self._chapter_name_cache.get(parent_key)
+        if chapter_name is None:
+            chapter_name = self._chapter_name_from_txt_file(txt_file_name)
+            self._chapter_name_cache[parent_key] = chapter_name
         if chapter_name == self.last_chapter_name:
             return ""
         else:
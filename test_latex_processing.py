@@ -3,13 +3,30 @@ from pathlib import Path
 from latex_processing import TxtFile, TexDocument, FileNotFound
 
 
-@pytest.fixture
-def example_text_file(tmp_path):
-    tmp_path = tmp_path / "diary_test"
-    tmp_path.mkdir(parents=True, exist_ok=True)
-    file_path = tmp_path / "example.txt"
-    with open(file_path, "w") as file:
-        file.write("This is some text with $math$.\n\nHello.")
+# Constants for test_texdocument_generate_save, built once at import time
+# rather than on every test invocation.
+PREAMBLE_CONTENT = "\\documentclass{article}\n\\title{My Title}\n"
+EXPECTED_CONTENT = (
+    f"{PREAMBLE_CONTENT}\n"
+    "\\begin{document}\n\n"
+    "\\maketitle\n\n\n"
+    "\\tableofcontents\n\n\n"
+    "\\chapter{Test}\n\n"
+    "\\section{This is some text with $math$.}\n\n"
+    "Hello.\n\n\n\n"
+    "\\end{document}"
+)
+
+
+@pytest.fixture(scope="session")
+def example_text_file(fs_session):
+    # Use pyfakefs' in-memory filesystem, so the tests exercise the real
+    # I/O code paths without touching the disk. Session-scoped: the file
+    # is constant and only read by the tests, so create it once.
+    file_path = Path("/diary_test/example.txt")
+    fs_session.create_file(
+        file_path, contents="This is some text with $math$.\n\nHello."
+    )
     return file_path
 
 
@@ -26,13 +43,11 @@ def test_textfile_to_latex_file_not_found():
         text_file.to_latex()
 
 
-def test_texdocument_generate_save(tmp_path, example_text_file):
-    preamble_content = "\\documentclass{article}\n\\title{My Title}\n"
-    preamble_file = tmp_path / "preamble.tex"
-    with open(preamble_file, "w") as preamble:
-        preamble.write(preamble_content)
+def test_texdocument_generate_save(fs, example_text_file):
+    preamble_file = Path("/preamble.tex")
+    fs.create_file(preamble_file, contents=PREAMBLE_CONTENT)
 
-    output_file = tmp_path / "output.tex"
+    output_file = Path("/output.tex")
 
     tex_document = TexDocument(
         [example_text_file], str(preamble_file), str(output_file)
@@ -41,29 +56,25 @@ def test_texdocument_generate_save(tmp_path, example_text_file):
 
     assert output_file.exists()
 
-    with open(output_file, "r") as result_file:
-        result_content = result_file.read()
-        expected_content = (
-            preamble_content
-            + "\n"
-            + "\\begin{document}\n\n"
-            + "\\maketitle\n\n\n"
-            + "\\tableofcontents\n\n\n"
-            + "\\chapter{Test}\n\n"
-            + "\\section{This is some text with $math$.}\n\n"
-            + "Hello.\n\n\n\n"
-            + "\\end{document}"
-        )
-
-        assert result_content == expected_content, result_content
-
-
-def test_texdocument_chapter_name_from_txt_file():
-    tex_document = TexDocument([], "", "")
-    txt_file = Path("diary_example") / "2000_01_01.txt"
-    chapter_name = tex_document._chapter_name_from_txt_file(txt_file)
-    assert chapter_name == "Example"
-
-    txt_file = Path("diary_long_example") / "2000_01_01.txt"
-    chapter_name = tex_document._chapter_name_from_txt_file(txt_file)
-    assert chapter_name == "Long Example"
+    result_content = output_file.read_text()
+    assert result_content == EXPECTED_CONTENT, result_content
+
+
+@pytest.fixture(scope="module")
+def empty_tex_document():
+    return TexDocument([], "", "")
+
+
+@pytest.mark.parametrize(
+    "dir_name,expected",
+    [
+        ("diary_example", "Example"),
+        ("diary_long_example", "Long Example"),
+    ],
+)
+def test_texdocument_chapter_name_from_txt_file(
+    empty_tex_document, dir_name, expected
+):
+    txt_file = Path(dir_name) / "2000_01_01.txt"
+    chapter_name = empty_tex_document._chapter_name_from_txt_file(txt_file)
+    assert chapter_name == expected